@@ -0,0 +1,131 @@
+"""
+Daily Motivation Bot - batch entry point.
+Runs the send pipeline directly, without the FastAPI server.
+
+Usage:
+    python -m app [--dry-run] [--to EMAIL | --recipients-file PATH]
+"""
+
+import argparse
+import sys
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from app.config import settings
+from app.services.daily_email import send_daily_email
+
+
+class _RecipientReader:
+    """
+    Stream recipient emails from an open file, one per line.
+    
+    Blank lines and lines starting with '#' are skipped. A decoding error stops
+    the stream and is kept in `error` so sends already made are still reported.
+    """
+    
+    def __init__(self, handle: TextIO):
+        self.handle = handle
+        self.error: Optional[UnicodeDecodeError] = None
+    
+    def __iter__(self) -> Iterator[str]:
+        try:
+            for line in self.handle:
+                email = line.strip()
+                if email and not email.startswith("#"):
+                    yield email
+        except UnicodeDecodeError as e:
+            print(f"❌ Could not decode recipients file: {e}")
+            self.error = e
+
+
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m app",
+        description="Generate a motivational quote and email it without starting the API server."
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
+        "--to",
+        dest="to_email",
+        help="Send to this address only (overrides configured recipients)"
+    )
+    target.add_argument(
+        "--recipients-file",
+        help="File with one recipient email per line ('-' for stdin), read as it is sent"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Generate the quote and email, list recipients, but do not send"
+    )
+    return parser.parse_args(argv)
+
+
+def _print_timings(timings: Dict[str, float]) -> None:
+    """Print the elapsed time of each pipeline stage that ran."""
+    for stage, elapsed in timings.items():
+        print(f"⏱️  {stage}: {elapsed:.2f}s")
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the daily send pipeline once.
+    
+    Args:
+        argv: Command-line arguments (defaults to sys.argv)
+    
+    Returns:
+        int: Process exit code (0 if at least one email was sent or dry-run succeeded)
+    """
+    args = _parse_args(argv)
+    timings: Dict[str, float] = {}
+    
+    handle = None
+    reader = None
+    if args.to_email:
+        recipients = [args.to_email]
+    elif args.recipients_file:
+        # Open before generating so a bad path does not cost a Groq call
+        try:
+            if args.recipients_file == "-":
+                handle = sys.stdin
+            else:
+                handle = open(args.recipients_file, encoding="utf-8")
+        except OSError as e:
+            print(f"❌ Could not open recipients file: {e}")
+            return 1
+        recipients = reader = _RecipientReader(handle)
+    else:
+        recipients = settings.get_recipient_emails()
+        if not recipients:
+            print("❌ No recipient email found. Use --to, --recipients-file or set RECIPIENT_EMAILS.")
+            return 1
+    
+    try:
+        result = send_daily_email(recipients, dry_run=args.dry_run, timings=timings)
+    except Exception as e:
+        print(f"❌ Error sending daily email: {e}")
+        _print_timings(timings)
+        return 1
+    finally:
+        if handle is not None and handle is not sys.stdin:
+            handle.close()
+    
+    _print_timings(timings)
+    
+    if reader is not None and reader.error is not None:
+        return 1
+    
+    if not result.total:
+        print("❌ No recipient email found in the recipients file.")
+        return 1
+    
+    if args.dry_run:
+        print(f"📊 Dry run: {result.total} recipient(s), nothing sent")
+        return 0
+    
+    return 0 if result.sent_to else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run())
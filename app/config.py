@@ -4,7 +4,7 @@ Handles environment variables and application settings.
 """
 
 import os
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Union
 
 from dotenv import load_dotenv
 
@@ -12,6 +12,36 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _get_bounded_number(
+    name: str,
+    default: str,
+    minimum: float,
+    maximum: Optional[float] = None,
+    cast: Callable[[str], Union[int, float]] = float
+) -> Union[int, float]:
+    """
+    Read a numeric environment variable, clamping it into [minimum, maximum].
+    
+    Args:
+        name: Environment variable name
+        default: Default value used when the variable is not set
+        minimum: Lowest accepted value
+        maximum: Highest accepted value, or None for no upper bound
+        cast: Numeric type to convert the value to
+        
+    Returns:
+        Union[int, float]: The value, clamped into range
+    """
+    value = cast(os.getenv(name, default))
+    bounded = max(value, minimum)
+    if maximum is not None:
+        bounded = min(bounded, maximum)
+    
+    if bounded != value:
+        print(f"⚠️  WARNING: {name}={value} is out of range, using {bounded}")
+    return cast(bounded)
+
+
 class Settings:
     """Application settings loaded from environment variables."""
     
@@ -30,6 +60,19 @@ class Settings:
     ] if os.getenv("RECIPIENT_EMAILS") else []
     SENDER_NAME: str = os.getenv("SENDER_NAME", "Mehdi")
     
+    # Send-rate Controller Configuration (AIMD per relay and destination domain)
+    SMTP_RATE_MIN: float = _get_bounded_number("SMTP_RATE_MIN", "0.1", minimum=0.01)
+    SMTP_RATE_MAX: float = _get_bounded_number("SMTP_RATE_MAX", "5.0", minimum=SMTP_RATE_MIN)
+    SMTP_RATE_INITIAL: float = _get_bounded_number(
+        "SMTP_RATE_INITIAL", "1.0", minimum=SMTP_RATE_MIN, maximum=SMTP_RATE_MAX
+    )
+    SMTP_RATE_INCREASE: float = _get_bounded_number("SMTP_RATE_INCREASE", "0.2", minimum=0.0)
+    SMTP_RATE_DECREASE: float = _get_bounded_number("SMTP_RATE_DECREASE", "0.5", minimum=0.1, maximum=0.9)
+    SMTP_LATENCY_TARGET: float = _get_bounded_number("SMTP_LATENCY_TARGET", "5.0", minimum=0.1)
+    SMTP_TIMEOUT: float = _get_bounded_number("SMTP_TIMEOUT", "15.0", minimum=1.0)
+    SMTP_MAX_CONCURRENCY: int = _get_bounded_number("SMTP_MAX_CONCURRENCY", "4", minimum=1, cast=int)
+    SMTP_MAX_RETRIES: int = _get_bounded_number("SMTP_MAX_RETRIES", "2", minimum=0, cast=int)
+    
     # Scheduler Configuration
     SCHEDULE_HOUR: int = int(os.getenv("SCHEDULE_HOUR", "6"))
     SCHEDULE_MINUTE: int = int(os.getenv("SCHEDULE_MINUTE", "30"))
@@ -7,9 +7,7 @@ from fastapi import FastAPI, HTTPException
 
 from app.config import settings
 from app.models.schemas import EmailResponse, TriggerRequest
-from app.services.email_service import get_email_service
-from app.services.groq_client import get_groq_client
-from app.templates.email_templates import EmailTemplateBuilder
+from app.services.daily_email import send_daily_email
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -33,13 +31,15 @@ async def root():
 
 
 @app.post("/send-daily-love-email", response_model=EmailResponse)
-async def send_daily_motivation_email(request: TriggerRequest):
+def send_daily_motivation_email(request: TriggerRequest):
     """
     Generate a motivational quote and send it via email.
     If to_email is provided, sends to that address only.
     Otherwise, sends to all configured recipients.
     
     This endpoint is designed to be called by Render Cron Job for serverless execution.
+    It is a plain function so FastAPI runs it in a worker thread; sends are paced
+    by the rate controller and must not block the event loop.
     
     Args:
         request: Request body with optional to_email override
@@ -65,30 +65,8 @@ async def send_daily_motivation_email(request: TriggerRequest):
         
         print(f"📧 Sending emails to: {', '.join(recipient_emails)}")
         
-        # Generate motivational quote
-        groq_client = get_groq_client()
-        quote = groq_client.generate_quote()
-        
-        # Build email template
-        html_body = EmailTemplateBuilder.build_motivational_email(quote)
-        subject = "Ta citation motivationnelle du jour 💪"
-        
-        # Send email to all recipients
-        email_service = get_email_service()
-        sent_to_list = []
-        
-        for email in recipient_emails:
-            try:
-                email_service.send_email(
-                    subject=subject,
-                    plain_body=quote,
-                    html_body=html_body,
-                    to_email=email
-                )
-                sent_to_list.append(email)
-                print(f"✅ Email sent successfully to {email}")
-            except Exception as e:
-                print(f"❌ Failed to send email to {email}: {e}")
+        result = send_daily_email(recipient_emails)
+        sent_to_list = result.sent_to
         
         if not sent_to_list:
             raise HTTPException(
@@ -98,12 +76,10 @@ async def send_daily_motivation_email(request: TriggerRequest):
         
         sent_to_str = ", ".join(sent_to_list) if len(sent_to_list) > 1 else sent_to_list[0]
         
-        print(f"📊 Sent {len(sent_to_list)}/{len(recipient_emails)} emails successfully")
-        
         return EmailResponse(
             status="ok",
             sent_to=sent_to_str,
-            quote=quote
+            quote=result.quote
         )
         
     except HTTPException:
@@ -0,0 +1,83 @@
+"""
+Daily email pipeline shared by the API endpoint and the batch entry point.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from app.services.email_service import get_email_service
+from app.services.groq_client import get_groq_client
+from app.templates.email_templates import EmailTemplateBuilder
+
+DAILY_SUBJECT = "Ta citation motivationnelle du jour 💪"
+
+
+class DailySendResult:
+    """Outcome of one run of the daily email pipeline."""
+    
+    def __init__(self, quote: str, sent_to: List[str], total: int):
+        self.quote = quote
+        self.sent_to = sent_to
+        self.total = total
+
+
+@contextmanager
+def _timed(stage: str, timings: Optional[Dict[str, float]]) -> Iterator[None]:
+    """Record the elapsed time of a pipeline stage, if timings are requested."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = time.perf_counter() - started
+
+
+def send_daily_email(
+    recipients: Iterable[str],
+    dry_run: bool = False,
+    timings: Optional[Dict[str, float]] = None
+) -> DailySendResult:
+    """
+    Generate a motivational quote, render it and send it to each recipient.
+    
+    Args:
+        recipients: Recipient email addresses, consumed lazily
+        dry_run: If True, list recipients without connecting to SMTP
+        timings: Optional dict filled with elapsed seconds per stage
+            ("generate", "render", "send"), even if a stage fails
+    
+    Returns:
+        DailySendResult: The quote, addresses sent to and number of recipients
+    
+    Raises:
+        ValueError: If Groq or SMTP configuration is missing
+        Exception: If quote generation fails
+    """
+    # Check SMTP configuration before paying for a quote
+    email_service = None if dry_run else get_email_service()
+    
+    with _timed("generate", timings):
+        quote = get_groq_client().generate_quote()
+    
+    with _timed("render", timings):
+        html_body = EmailTemplateBuilder.build_motivational_email(quote)
+    
+    if email_service is None:
+        total = 0
+        with _timed("send", timings):
+            for email in recipients:
+                total += 1
+                print(f"📝 [dry-run] Would send email to {email}")
+        return DailySendResult(quote, [], total)
+    
+    with _timed("send", timings):
+        sent_to, total = email_service.send_bulk(
+            subject=DAILY_SUBJECT,
+            plain_body=quote,
+            html_body=html_body,
+            recipients=recipients
+        )
+    
+    print(f"📊 Sent {len(sent_to)}/{total} emails successfully")
+    return DailySendResult(quote, sent_to, total)
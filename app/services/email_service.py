@@ -3,10 +3,36 @@ Email service for sending motivational quotes via SMTP.
 """
 
 import smtplib
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from email.message import EmailMessage
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from app.config import settings
+from app.services.rate_controller import (
+    OUTCOME_DEFERRED,
+    OUTCOME_SUCCESS,
+    classify_smtp_error,
+    get_rate_controller,
+    is_recipient_level_error,
+)
+
+
+class EmailSendError(Exception):
+    """Raised when an email could not be sent, with the classified SMTP outcome."""
+    
+    def __init__(self, message: str, outcome: str, smtp_code: Optional[int] = None):
+        super().__init__(message)
+        self.outcome = outcome
+        self.smtp_code = smtp_code
+
+
+class _DeliveryUncertain(Exception):
+    """Connection lost after the message was handed to the relay; it may have been delivered."""
+    
+    def __init__(self, cause: Exception):
+        super().__init__(str(cause))
+        self.cause = cause
 
 
 class EmailService:
@@ -19,6 +45,10 @@ class EmailService:
         self.smtp_user = settings.SMTP_USER
         self.smtp_password = settings.SMTP_PASSWORD
         self.sender_name = settings.SENDER_NAME
+        self.timeout = settings.SMTP_TIMEOUT
+        self.max_retries = settings.SMTP_MAX_RETRIES
+        self.max_concurrency = settings.SMTP_MAX_CONCURRENCY
+        self.rate_controller = get_rate_controller()
         
         if not self.smtp_user or not self.smtp_password:
             raise ValueError("SMTP credentials are not set in environment variables")
@@ -42,6 +72,29 @@ class EmailService:
         
         return msg
     
+    def _deliver(self, msg: EmailMessage, to_email: str) -> None:
+        """Open an SMTP session and deliver a single message."""
+        print(f"🔌 Connecting to {self.smtp_host}:{self.smtp_port}...")
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=self.timeout)
+        try:
+            server.starttls()
+            server.login(self.smtp_user, self.smtp_password)
+            
+            print(f"✉️  Sending email to {to_email}...")
+            try:
+                server.send_message(msg)
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+                # The relay answered with a reply code, so the message was not accepted
+                raise
+            except OSError as e:
+                raise _DeliveryUncertain(e)
+        finally:
+            # Once send_message returns the message is delivered; a failed QUIT must not cause a resend
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+    
     def send_email(
         self,
         subject: str,
@@ -52,6 +105,10 @@ class EmailService:
         """
         Send an HTML email via SMTP.
         
+        Sends are paced by the adaptive rate controller. Temporary deferrals
+        (4xx replies, dropped connections) are retried up to SMTP_MAX_RETRIES times,
+        except when the connection drops after the message was handed over.
+        
         Args:
             subject: Email subject line
             plain_body: Plain text version of the email
@@ -59,29 +116,95 @@ class EmailService:
             to_email: Recipient email address
             
         Raises:
-            Exception: If SMTP connection or sending fails
+            EmailSendError: If SMTP connection or sending fails
         """
         print(f"📧 Preparing to send email to {to_email}...")
         
         msg = self._create_email_message(subject, plain_body, html_body, to_email)
+        keys = self.rate_controller.keys_for(self.smtp_host, to_email)
         
-        try:
-            # Connect to SMTP server
-            print(f"🔌 Connecting to {self.smtp_host}:{self.smtp_port}...")
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_user, self.smtp_password)
+        for attempt in range(self.max_retries + 1):
+            self.rate_controller.acquire(keys)
+            started = time.monotonic()
+            try:
+                self._deliver(msg, to_email)
+            except Exception as e:
+                uncertain = isinstance(e, _DeliveryUncertain)
+                error = e.cause if uncertain else e
+                outcome, smtp_code = classify_smtp_error(error)
+                self.rate_controller.record(
+                    keys,
+                    outcome,
+                    time.monotonic() - started,
+                    recipient_level=is_recipient_level_error(error)
+                )
                 
-                print(f"✉️  Sending email to {to_email}...")
-                server.send_message(msg)
-                print(f"✅ Email sent successfully to {to_email}!")
+                if outcome == OUTCOME_DEFERRED and not uncertain and attempt < self.max_retries:
+                    print(f"⏳ Deferred by {self.smtp_host} ({smtp_code or 'no code'}), retrying {to_email}...")
+                    continue
                 
-        except smtplib.SMTPException as e:
-            print(f"❌ SMTP error: {e}")
-            raise Exception(f"Failed to send email: {str(e)}")
-        except Exception as e:
-            print(f"❌ Unexpected error sending email: {e}")
-            raise Exception(f"Failed to send email: {str(e)}")
+                print(f"❌ SMTP error ({outcome}): {error}")
+                raise EmailSendError(f"Failed to send email: {str(error)}", outcome, smtp_code)
+            
+            self.rate_controller.record(keys, OUTCOME_SUCCESS, time.monotonic() - started)
+            print(f"✅ Email sent successfully to {to_email}!")
+            return
+    
+    def send_bulk(
+        self,
+        subject: str,
+        plain_body: str,
+        html_body: str,
+        recipients: Iterable[str]
+    ) -> Tuple[List[str], int]:
+        """
+        Send the same email to many recipients in parallel.
+        
+        Up to SMTP_MAX_CONCURRENCY sends run at once; the rate controller decides
+        how many of them may actually talk to each relay and domain. Recipients
+        are consumed lazily, so large or streamed lists are never fully loaded.
+        
+        Args:
+            subject: Email subject line
+            plain_body: Plain text version of the email
+            html_body: HTML version of the email
+            recipients: Recipient email addresses
+            
+        Returns:
+            Tuple[List[str], int]: (addresses sent successfully in input order, number of recipients)
+        """
+        sent: List[Tuple[int, str]] = []
+        pending: Dict[Future, Tuple[int, str]] = {}
+        total = 0
+        
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for index, email in enumerate(recipients):
+                total += 1
+                if len(pending) >= self.max_concurrency:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    self._collect_results(done, pending, sent)
+                future = executor.submit(self.send_email, subject, plain_body, html_body, email)
+                pending[future] = (index, email)
+            
+            done, _ = wait(pending)
+            self._collect_results(done, pending, sent)
+        
+        return [email for _, email in sorted(sent)], total
+    
+    @staticmethod
+    def _collect_results(
+        done: Set[Future],
+        pending: Dict[Future, Tuple[int, str]],
+        sent: List[Tuple[int, str]]
+    ) -> None:
+        """Move finished sends out of pending, recording the successful ones."""
+        for future in done:
+            index, email = pending.pop(future)
+            try:
+                future.result()
+                sent.append((index, email))
+            except Exception as e:
+                print(f"❌ Failed to send email to {email}: {e}")
 
 
 def get_email_service() -> EmailService:
@@ -0,0 +1,211 @@
+"""
+Adaptive send-rate controller for SMTP delivery.
+
+Applies AIMD (additive increase, multiplicative decrease) per relay and per
+destination domain, driven by SMTP reply classes and per-send latency.
+"""
+
+import smtplib
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+
+# SMTP reply classes
+OUTCOME_SUCCESS = "success"
+OUTCOME_DEFERRED = "deferred"
+OUTCOME_FAILED = "failed"
+
+# Controller key prefixes
+RELAY_KEY_PREFIX = "relay:"
+DOMAIN_KEY_PREFIX = "domain:"
+
+
+def classify_smtp_code(code: Optional[int]) -> str:
+    """
+    Classify an SMTP reply code.
+    
+    Args:
+        code: SMTP reply code (e.g. 250, 421, 550), or None if unknown
+    
+    Returns:
+        str: One of OUTCOME_SUCCESS, OUTCOME_DEFERRED or OUTCOME_FAILED
+    """
+    if code is None:
+        return OUTCOME_DEFERRED
+    if 200 <= code < 400:
+        return OUTCOME_SUCCESS
+    if 400 <= code < 500:
+        return OUTCOME_DEFERRED
+    return OUTCOME_FAILED
+
+
+def _classify_error_code(code: Optional[int]) -> str:
+    """Classify a reply code attached to an exception; non-error codes count as failed."""
+    outcome = classify_smtp_code(code)
+    return OUTCOME_FAILED if outcome == OUTCOME_SUCCESS else outcome
+
+
+def classify_smtp_error(error: Exception) -> Tuple[str, Optional[int]]:
+    """
+    Classify an exception raised while talking to an SMTP server.
+    
+    Connection-level errors carry no reply code and are treated as
+    temporary, since the relay may simply be shedding load.
+    
+    Args:
+        error: Exception raised by smtplib or the socket layer
+    
+    Returns:
+        Tuple[str, Optional[int]]: (outcome, smtp_code) where smtp_code may be None
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        # Any temporary refusal means the message may still go through later
+        deferred = [code for code in codes if classify_smtp_code(code) == OUTCOME_DEFERRED]
+        code = deferred[0] if deferred else (codes[0] if codes else None)
+        return _classify_error_code(code), code
+    if isinstance(error, smtplib.SMTPResponseException):
+        return _classify_error_code(error.smtp_code), error.smtp_code
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return OUTCOME_DEFERRED, None
+    if isinstance(error, smtplib.SMTPException):
+        return OUTCOME_FAILED, None
+    if isinstance(error, OSError):
+        return OUTCOME_DEFERRED, None
+    return OUTCOME_FAILED, None
+
+
+def is_recipient_level_error(error: Exception) -> bool:
+    """
+    Check whether an SMTP error concerns the recipient rather than the session.
+    
+    Recipient refusals (e.g. greylisting or a busy mailbox) say nothing about
+    the relay's capacity, so they should only throttle the destination domain.
+    
+    Args:
+        error: Exception raised by smtplib or the socket layer
+    
+    Returns:
+        bool: True if the error is a per-recipient refusal
+    """
+    return isinstance(error, smtplib.SMTPRecipientsRefused)
+
+
+class _RateState:
+    """AIMD state for a single relay or destination domain."""
+    
+    def __init__(self):
+        """Initialize state from the configured starting values."""
+        self.rate = settings.SMTP_RATE_INITIAL
+        self.concurrency = 1
+        self.in_flight = 0
+        self.next_send_at = 0.0
+    
+    def increase(self) -> None:
+        """Additively raise rate and concurrency after a healthy send."""
+        self.rate = min(self.rate + settings.SMTP_RATE_INCREASE, settings.SMTP_RATE_MAX)
+        self.concurrency = min(self.concurrency + 1, settings.SMTP_MAX_CONCURRENCY)
+    
+    def decrease(self) -> None:
+        """Multiplicatively cut rate and concurrency after a deferral or slow send."""
+        self.rate = max(self.rate * settings.SMTP_RATE_DECREASE, settings.SMTP_RATE_MIN)
+        self.concurrency = max(int(self.concurrency * settings.SMTP_RATE_DECREASE), 1)
+
+
+class AdaptiveRateController:
+    """Thread-safe AIMD controller keyed by relay and destination domain."""
+    
+    def __init__(self):
+        """Initialize an empty controller."""
+        self._states: Dict[str, _RateState] = {}
+        self._condition = threading.Condition()
+    
+    @staticmethod
+    def keys_for(relay: str, to_email: str) -> List[str]:
+        """Build the controller keys for a relay and recipient address."""
+        domain = to_email.rsplit("@", 1)[-1].strip().lower()
+        return [f"{RELAY_KEY_PREFIX}{relay}", f"{DOMAIN_KEY_PREFIX}{domain}"]
+    
+    def _state(self, key: str) -> _RateState:
+        """Get or create the state for a key. Caller must hold the lock."""
+        if key not in self._states:
+            self._states[key] = _RateState()
+        return self._states[key]
+    
+    def acquire(self, keys: Iterable[str]) -> None:
+        """
+        Block until a send is allowed for every key, then reserve a slot.
+        
+        Args:
+            keys: Controller keys returned by keys_for()
+        """
+        keys = list(keys)
+        with self._condition:
+            while True:
+                states = [self._state(key) for key in keys]
+                if all(state.in_flight < state.concurrency for state in states):
+                    now = time.monotonic()
+                    wait = max(state.next_send_at for state in states) - now
+                    if wait <= 0:
+                        for state in states:
+                            state.in_flight += 1
+                            state.next_send_at = max(state.next_send_at, now) + 1.0 / state.rate
+                        return
+                    self._condition.wait(timeout=wait)
+                else:
+                    self._condition.wait()
+    
+    def record(
+        self,
+        keys: Iterable[str],
+        outcome: str,
+        latency: float,
+        recipient_level: bool = False
+    ) -> None:
+        """
+        Release a slot and adjust rates based on the send result.
+        
+        A deferral also pushes back the next allowed send by one interval at
+        the reduced rate, so retries back off. Permanent failures are
+        recipient-specific and leave rates unchanged. Recipient-level results
+        only adjust the destination domain, never the relay.
+        
+        Args:
+            keys: Controller keys passed to acquire()
+            outcome: One of OUTCOME_SUCCESS, OUTCOME_DEFERRED or OUTCOME_FAILED
+            latency: Duration of the send in seconds
+            recipient_level: True if the result came from a per-recipient refusal
+        """
+        with self._condition:
+            now = time.monotonic()
+            for key in keys:
+                state = self._state(key)
+                state.in_flight = max(state.in_flight - 1, 0)
+                if recipient_level and not key.startswith(DOMAIN_KEY_PREFIX):
+                    continue
+                if outcome == OUTCOME_DEFERRED or latency > settings.SMTP_LATENCY_TARGET:
+                    state.decrease()
+                    if outcome == OUTCOME_DEFERRED:
+                        state.next_send_at = max(state.next_send_at, now + 1.0 / state.rate)
+                elif outcome == OUTCOME_SUCCESS:
+                    state.increase()
+            self._condition.notify_all()
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Get current rate and concurrency for each key."""
+        with self._condition:
+            return {
+                key: {"rate": state.rate, "concurrency": state.concurrency}
+                for key, state in self._states.items()
+            }
+
+
+_rate_controller = AdaptiveRateController()
+
+
+def get_rate_controller() -> AdaptiveRateController:
+    """Get the process-wide rate controller so state survives across requests."""
+    return _rate_controller
@@ -0,0 +1,103 @@
+"""
+Tests for the `python -m app` batch entry point and the shared daily email pipeline.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app.__main__ import run
+from app.services.daily_email import DAILY_SUBJECT, send_daily_email
+
+QUOTE = "Crois en tes rêves. — Tony Robbins"
+
+
+class BatchEntryPointTests(unittest.TestCase):
+    """Tests for app.__main__.run."""
+    
+    def setUp(self):
+        groq_patcher = mock.patch("app.services.daily_email.get_groq_client")
+        self.groq = groq_patcher.start().return_value
+        self.groq.generate_quote.return_value = QUOTE
+        self.addCleanup(groq_patcher.stop)
+        
+        email_patcher = mock.patch("app.services.daily_email.get_email_service")
+        self.email_service = email_patcher.start().return_value
+        self.email_service.send_bulk.side_effect = self._send_bulk
+        self.addCleanup(email_patcher.stop)
+        self.sent = []
+    
+    def _send_bulk(self, subject, plain_body, html_body, recipients):
+        self.sent = list(recipients)
+        return self.sent, len(self.sent)
+    
+    def _write_recipients(self, content: bytes) -> str:
+        handle, path = tempfile.mkstemp(suffix=".txt")
+        os.write(handle, content)
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        return path
+    
+    def test_missing_recipients_file_fails_before_generating(self):
+        self.assertEqual(run(["--dry-run", "--recipients-file", "/nonexistent/recipients.txt"]), 1)
+        self.groq.generate_quote.assert_not_called()
+    
+    def test_to_and_recipients_file_are_mutually_exclusive(self):
+        with self.assertRaises(SystemExit), mock.patch("sys.stderr"):
+            run(["--to", "a@example.com", "--recipients-file", "recipients.txt"])
+    
+    def test_dry_run_streams_recipients_without_sending(self):
+        path = self._write_recipients(b"a@example.com\n# comment\n\nb@example.com\n")
+        
+        self.assertEqual(run(["--dry-run", "--recipients-file", path]), 0)
+        self.email_service.send_bulk.assert_not_called()
+    
+    def test_sends_to_recipients_file(self):
+        path = self._write_recipients(b"a@example.com\nb@example.com\n")
+        
+        self.assertEqual(run(["--recipients-file", path]), 0)
+        self.assertEqual(self.sent, ["a@example.com", "b@example.com"])
+    
+    def test_undecodable_recipients_file_fails(self):
+        path = self._write_recipients(b"a@example.com\n\xff\xfe\n")
+        
+        self.assertEqual(run(["--recipients-file", path]), 1)
+    
+    def test_generation_failure_fails(self):
+        self.groq.generate_quote.side_effect = Exception("Groq unavailable")
+        
+        self.assertEqual(run(["--to", "a@example.com"]), 1)
+
+
+class SendDailyEmailTests(unittest.TestCase):
+    """Tests for the shared send_daily_email pipeline."""
+    
+    @mock.patch("app.services.daily_email.get_email_service")
+    @mock.patch("app.services.daily_email.get_groq_client")
+    def test_sends_quote_and_records_timings(self, get_groq_client, get_email_service):
+        get_groq_client.return_value.generate_quote.return_value = QUOTE
+        email_service = get_email_service.return_value
+        email_service.send_bulk.return_value = (["a@example.com"], 2)
+        timings = {}
+        
+        result = send_daily_email(["a@example.com", "b@example.com"], timings=timings)
+        
+        self.assertEqual(result.quote, QUOTE)
+        self.assertEqual(result.sent_to, ["a@example.com"])
+        self.assertEqual(result.total, 2)
+        self.assertEqual(email_service.send_bulk.call_args.kwargs["subject"], DAILY_SUBJECT)
+        self.assertEqual(set(timings), {"generate", "render", "send"})
+    
+    @mock.patch("app.services.daily_email.get_email_service")
+    @mock.patch("app.services.daily_email.get_groq_client")
+    def test_missing_smtp_config_skips_generation(self, get_groq_client, get_email_service):
+        get_email_service.side_effect = ValueError("SMTP credentials are not set")
+        
+        with self.assertRaises(ValueError):
+            send_daily_email(["a@example.com"])
+        get_groq_client.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
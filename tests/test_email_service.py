@@ -0,0 +1,172 @@
+"""
+Tests for SMTP retries and parallel sending in EmailService.
+"""
+
+import smtplib
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app.config import settings
+from app.services.email_service import EmailSendError, EmailService
+from app.services.rate_controller import OUTCOME_DEFERRED, OUTCOME_FAILED, AdaptiveRateController
+
+
+class EmailServiceTests(unittest.TestCase):
+    """Tests for EmailService.send_email and EmailService.send_bulk."""
+    
+    def setUp(self):
+        # Fast rates keep deferral backoff in the millisecond range
+        overrides = {
+            "SMTP_USER": "bot@example.com",
+            "SMTP_PASSWORD": "secret",
+            "SMTP_RATE_INITIAL": 500.0,
+            "SMTP_RATE_MIN": 100.0,
+            "SMTP_RATE_MAX": 1000.0,
+            "SMTP_MAX_RETRIES": 2,
+            "SMTP_MAX_CONCURRENCY": 4,
+        }
+        for name, value in overrides.items():
+            patcher = mock.patch.object(settings, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        
+        self.service = EmailService()
+        self.service.rate_controller = AdaptiveRateController()
+    
+    def _send(self, to_email="someone@example.com"):
+        self.service.send_email("Subject", "plain", "<p>html</p>", to_email)
+    
+    @mock.patch("app.services.email_service.smtplib.SMTP")
+    def test_deferral_is_retried(self, smtp):
+        server = smtp.return_value
+        server.send_message.side_effect = [smtplib.SMTPDataError(421, b"Try later"), {}]
+        
+        self._send()
+        
+        self.assertEqual(server.send_message.call_count, 2)
+    
+    @mock.patch("app.services.email_service.smtplib.SMTP")
+    def test_deferral_gives_up_after_max_retries(self, smtp):
+        server = smtp.return_value
+        server.send_message.side_effect = smtplib.SMTPDataError(451, b"Try later")
+        
+        with self.assertRaises(EmailSendError) as ctx:
+            self._send()
+        
+        self.assertEqual(ctx.exception.outcome, OUTCOME_DEFERRED)
+        self.assertEqual(server.send_message.call_count, settings.SMTP_MAX_RETRIES + 1)
+    
+    @mock.patch("app.services.email_service.smtplib.SMTP")
+    def test_permanent_failure_is_not_retried(self, smtp):
+        server = smtp.return_value
+        server.send_message.side_effect = smtplib.SMTPRecipientsRefused(
+            {"someone@example.com": (550, b"No such user")}
+        )
+        
+        with self.assertRaises(EmailSendError) as ctx:
+            self._send()
+        
+        self.assertEqual(ctx.exception.outcome, OUTCOME_FAILED)
+        self.assertEqual(ctx.exception.smtp_code, 550)
+        self.assertEqual(server.send_message.call_count, 1)
+    
+    @mock.patch("app.services.email_service.smtplib.SMTP")
+    def test_greylisted_recipient_does_not_throttle_relay(self, smtp):
+        server = smtp.return_value
+        server.send_message.side_effect = [
+            smtplib.SMTPRecipientsRefused({"someone@example.com": (451, b"Greylisted")}),
+            {},
+        ]
+        
+        self._send()
+        
+        rates = self.service.rate_controller.snapshot()
+        self.assertGreater(rates[f"relay:{settings.SMTP_HOST}"]["rate"], settings.SMTP_RATE_INITIAL)
+        self.assertLess(rates["domain:example.com"]["rate"], settings.SMTP_RATE_INITIAL)
+    
+    @mock.patch("app.services.email_service.smtplib.SMTP")
+    def test_disconnect_before_sending_is_retried(self, smtp):
+        server = smtp.return_value
+        server.login.side_effect = [smtplib.SMTPServerDisconnected("closed"), None]
+        
+        self._send()
+        
+        self.assertEqual(server.send_message.call_count, 1)
+    
+    @mock.patch("app.services.email_service.smtplib.SMTP")
+    def test_disconnect_while_sending_is_not_retried(self, smtp):
+        server = smtp.return_value
+        server.send_message.side_effect = smtplib.SMTPServerDisconnected("closed")
+        
+        with self.assertRaises(EmailSendError):
+            self._send()
+        
+        self.assertEqual(server.send_message.call_count, 1)
+    
+    @mock.patch("app.services.email_service.smtplib.SMTP")
+    def test_failed_quit_after_sending_counts_as_success(self, smtp):
+        server = smtp.return_value
+        keys = self.service.rate_controller.keys_for(settings.SMTP_HOST, "someone@example.com")
+        
+        for quit_error in (smtplib.SMTPResponseException(421, b"Closing"), socket.timeout("timed out")):
+            server.reset_mock()
+            server.quit.side_effect = quit_error
+            rate_before = self.service.rate_controller.snapshot().get(keys[0], {"rate": 0.0})["rate"]
+            
+            self._send()
+            
+            self.assertEqual(server.send_message.call_count, 1)
+            server.close.assert_called_once()
+            self.assertGreater(self.service.rate_controller.snapshot()[keys[0]]["rate"], rate_before)
+    
+    @mock.patch("app.services.email_service.smtplib.SMTP")
+    def test_connection_uses_timeout(self, smtp):
+        self._send()
+        
+        smtp.assert_called_once_with(
+            settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT
+        )
+    
+    def test_send_bulk_runs_sends_in_parallel(self):
+        lock = threading.Lock()
+        active = []
+        peak = []
+        
+        def deliver(msg, to_email):
+            with lock:
+                active.append(to_email)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(to_email)
+        
+        self.service._deliver = deliver
+        recipients = [f"user{i}@domain{i}.com" for i in range(8)]
+        
+        sent, total = self.service.send_bulk("Subject", "plain", "<p>html</p>", iter(recipients))
+        
+        self.assertEqual(sent, recipients)
+        self.assertEqual(total, len(recipients))
+        self.assertGreater(max(peak), 1)
+        self.assertLessEqual(max(peak), settings.SMTP_MAX_CONCURRENCY)
+    
+    def test_send_bulk_reports_only_successful_sends(self):
+        def deliver(msg, to_email):
+            if to_email.startswith("bad"):
+                raise smtplib.SMTPDataError(550, b"Rejected")
+        
+        self.service._deliver = deliver
+        
+        sent, total = self.service.send_bulk(
+            "Subject", "plain", "<p>html</p>", ["a@example.com", "bad@example.com", "b@example.com"]
+        )
+        
+        self.assertEqual(sent, ["a@example.com", "b@example.com"])
+        self.assertEqual(total, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
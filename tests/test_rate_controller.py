@@ -0,0 +1,107 @@
+"""
+Tests for the adaptive SMTP send-rate controller.
+"""
+
+import smtplib
+import time
+import unittest
+
+from app.config import settings
+from app.services.rate_controller import (
+    OUTCOME_DEFERRED,
+    OUTCOME_FAILED,
+    OUTCOME_SUCCESS,
+    AdaptiveRateController,
+    classify_smtp_error,
+    is_recipient_level_error,
+)
+
+
+class ClassifySmtpErrorTests(unittest.TestCase):
+    """Tests for classify_smtp_error."""
+    
+    def test_temporary_reply_is_deferred(self):
+        error = smtplib.SMTPResponseException(421, b"Try again later")
+        self.assertEqual(classify_smtp_error(error), (OUTCOME_DEFERRED, 421))
+    
+    def test_permanent_reply_is_failed(self):
+        error = smtplib.SMTPDataError(550, b"Mailbox unavailable")
+        self.assertEqual(classify_smtp_error(error), (OUTCOME_FAILED, 550))
+    
+    def test_non_error_reply_is_failed(self):
+        error = smtplib.SMTPResponseException(250, b"OK")
+        self.assertEqual(classify_smtp_error(error), (OUTCOME_FAILED, 250))
+    
+    def test_disconnect_is_deferred(self):
+        error = smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.assertEqual(classify_smtp_error(error), (OUTCOME_DEFERRED, None))
+    
+    def test_socket_error_is_deferred(self):
+        self.assertEqual(classify_smtp_error(OSError("timed out")), (OUTCOME_DEFERRED, None))
+    
+    def test_recipients_refused_temporarily_is_deferred(self):
+        error = smtplib.SMTPRecipientsRefused({"a@example.com": (451, b"Try later")})
+        self.assertEqual(classify_smtp_error(error), (OUTCOME_DEFERRED, 451))
+    
+    def test_only_recipient_refusals_are_recipient_level(self):
+        refused = smtplib.SMTPRecipientsRefused({"a@example.com": (450, b"Greylisted")})
+        self.assertTrue(is_recipient_level_error(refused))
+        self.assertFalse(is_recipient_level_error(smtplib.SMTPResponseException(421, b"Busy")))
+        self.assertFalse(is_recipient_level_error(smtplib.SMTPServerDisconnected("closed")))
+        self.assertFalse(is_recipient_level_error(OSError("timed out")))
+    
+    def test_recipients_refused_permanently_is_failed(self):
+        error = smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"No such user")})
+        self.assertEqual(classify_smtp_error(error), (OUTCOME_FAILED, 550))
+
+
+class AdaptiveRateControllerTests(unittest.TestCase):
+    """Tests for AIMD adjustments in AdaptiveRateController."""
+    
+    def setUp(self):
+        self.controller = AdaptiveRateController()
+        self.keys = self.controller.keys_for("smtp.example.com", "someone@Example.com")
+        self.controller.acquire(self.keys)
+    
+    def _rates(self):
+        return {key: state["rate"] for key, state in self.controller.snapshot().items()}
+    
+    def test_keys_cover_relay_and_domain(self):
+        self.assertEqual(self.keys, ["relay:smtp.example.com", "domain:example.com"])
+    
+    def test_fast_success_increases_rate(self):
+        self.controller.record(self.keys, OUTCOME_SUCCESS, latency=0.1)
+        expected = settings.SMTP_RATE_INITIAL + settings.SMTP_RATE_INCREASE
+        for rate in self._rates().values():
+            self.assertAlmostEqual(rate, expected)
+    
+    def test_deferral_decreases_rate_and_delays_next_send(self):
+        self.controller.record(self.keys, OUTCOME_DEFERRED, latency=0.1)
+        expected = settings.SMTP_RATE_INITIAL * settings.SMTP_RATE_DECREASE
+        for rate in self._rates().values():
+            self.assertAlmostEqual(rate, expected)
+        for key in self.keys:
+            self.assertGreater(self.controller._states[key].next_send_at, time.monotonic())
+    
+    def test_slow_success_decreases_rate(self):
+        self.controller.record(self.keys, OUTCOME_SUCCESS, latency=settings.SMTP_LATENCY_TARGET + 1)
+        expected = settings.SMTP_RATE_INITIAL * settings.SMTP_RATE_DECREASE
+        for rate in self._rates().values():
+            self.assertAlmostEqual(rate, expected)
+    
+    def test_recipient_deferral_only_throttles_domain(self):
+        self.controller.record(self.keys, OUTCOME_DEFERRED, latency=0.1, recipient_level=True)
+        rates = self._rates()
+        self.assertAlmostEqual(rates["relay:smtp.example.com"], settings.SMTP_RATE_INITIAL)
+        self.assertAlmostEqual(
+            rates["domain:example.com"], settings.SMTP_RATE_INITIAL * settings.SMTP_RATE_DECREASE
+        )
+    
+    def test_permanent_failure_leaves_rate_unchanged(self):
+        self.controller.record(self.keys, OUTCOME_FAILED, latency=0.1)
+        for rate in self._rates().values():
+            self.assertAlmostEqual(rate, settings.SMTP_RATE_INITIAL)
+
+
+if __name__ == "__main__":
+    unittest.main()